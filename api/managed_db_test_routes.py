@@ -25,13 +25,13 @@ async def test_store_warm(
     3. Auto-flushes if the buffer reaches the flush threshold.
     Returns the assigned ground_truth_id and current buffer size.
     """
-    logger.info(f"[managed/store-warm] text='{body.text}'")
+    logger.info("[managed/store-warm] text='%s'", body.text)
 
     start = time.perf_counter()
     gt_id = await extended_memory.store_via_warm_buffer(body.text)
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    logger.info(f"[managed/store-warm] ground_truth_id={gt_id}, buffer_size={len(extended_memory._warm_buffer)}")
+    logger.info("[managed/store-warm] ground_truth_id=%s, buffer_size=%s", gt_id, len(extended_memory._warm_buffer))
 
     return {
         "text": body.text,
@@ -57,7 +57,7 @@ async def test_flush_warm(
     count = await extended_memory.flush_warm_buffer()
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    logger.info(f"[managed/flush-warm] flushed {count} entries in {round(elapsed_ms, 2)}ms")
+    logger.info("[managed/flush-warm] flushed %s entries in %.2fms", count, elapsed_ms)
 
     return {
         "flushed_count": count,
@@ -75,13 +75,13 @@ async def test_managed_retrieve(
     When the warm buffer is non-empty, also searches it and validates candidates
     against the ground_truth table before returning.
     """
-    logger.info(f"[managed/retrieve] query='{query}', limit={limit}")
+    logger.info("[managed/retrieve] query='%s', limit=%s", query, limit)
 
     start = time.perf_counter()
     results = await extended_memory.retrieve(query=query, limit=limit)
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    logger.info(f"[managed/retrieve] total elapsed: {round(elapsed_ms, 2)}ms")
+    logger.info("[managed/retrieve] total elapsed: %.2fms", elapsed_ms)
 
     return {
         "query": query,
@@ -103,13 +103,13 @@ async def test_managed_retrieve_reranked(
     When the warm buffer is non-empty, also searches it and validates candidates
     against the ground_truth table before reranking.
     """
-    logger.info(f"[managed/retrieve-reranked] query='{query}', limit={limit}, retrieval_size={retrieval_size}")
+    logger.info("[managed/retrieve-reranked] query='%s', limit=%s, retrieval_size=%s", query, limit, retrieval_size)
 
     start = time.perf_counter()
     results = await extended_memory.retrieve_and_rerank(query=query, limit=limit, retrieval_size=retrieval_size)
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    logger.info(f"[managed/retrieve-reranked] total elapsed: {round(elapsed_ms, 2)}ms")
+    logger.info("[managed/retrieve-reranked] total elapsed: %.2fms", elapsed_ms)
 
     return {
         "query": query,
@@ -1,6 +1,9 @@
 # test routes
-import json
+import asyncio
+import itertools
 import time
+
+import orjson
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from sqlalchemy import text
@@ -8,15 +11,23 @@ import redis.asyncio as aioredis
 
 from common.logger import logger
 from common.timer import async_timer
-from core.dependencies import get_main_db_engine, get_gemini_text_embedding_client, get_memory_retriever, get_redis_client
+from core.config import get_service_settings
+from core.dependencies import get_main_db_engine, get_batched_embedder, get_memory_retriever, get_redis_client
+from models.embeddings.batched_embedder import BatchedEmbedder
 from db.crud import store_vector
 from db.session import get_async_session_maker
 from memory_interface import MemoryInterface
-from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 router = APIRouter(prefix="/test", tags=["Test"])
 
+# chunk size for batched MGETs in /redis-cache (amortizes RTT without one giant reply)
+_MGET_CHUNK_SIZE = 500
+
+# values per decode chunk; orjson releases the GIL while parsing, so chunks
+# spread across threads actually run in parallel on large caches
+_DECODE_CHUNK_SIZE = 256
+
 # request body using pydantic
 class EmbedStoreRequest(BaseModel):
     text: str
@@ -27,13 +38,13 @@ async def test_retrieve(
     limit: int = 5,
     memory: MemoryInterface = Depends(get_memory_retriever),
 ):
-    logger.info(f"[test/retrieve] query='{query}', limit={limit}")
+    logger.info("[test/retrieve] query='%s', limit=%s", query, limit)
 
     start = time.perf_counter()
     results = await memory.retrieve(query=query, limit=limit)
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    logger.info(f"total elapsed time: {round(elapsed_ms, 2)}")
+    logger.info("total elapsed time: %.2f", elapsed_ms)
 
     return {
         "query": query,
@@ -45,25 +56,24 @@ async def test_retrieve(
 @router.post("/embed-and-store")
 async def test_embed_and_store(
     body: EmbedStoreRequest,
-    embedding_client: GenAITextEmbeddingClient = Depends(get_gemini_text_embedding_client),
+    batched_embedder: BatchedEmbedder = Depends(get_batched_embedder),
     engine: AsyncEngine = Depends(get_main_db_engine),
 ):
-    logger.info(f"[test/embed-and-store] text='{body.text}'")
+    logger.info("[test/embed-and-store] text='%s'", body.text)
 
-    async with async_timer("aembed_text"):
-        embeddings = await embedding_client.aembed_text([body.text], task_type="RETRIEVAL_DOCUMENT")
+    # concurrent requests within the batching window share one Gemini call
+    async with async_timer("batched_embed"):
+        vector = await batched_embedder.embed(body.text, task_type="RETRIEVAL_DOCUMENT")
 
-    if not embeddings:
+    if vector is None:
         logger.error("[test/embed-and-store] embedding failed")
         return {"error": "Embedding failed"}
-
-    vector = embeddings[0]
-    logger.info(f"[test/embed-and-store] vector length: {len(vector)}")
+    logger.info("[test/embed-and-store] vector length: %s", len(vector))
 
     async with async_timer("store_vector"):
         row = await store_vector(vector=vector, text=body.text, engine=engine)
 
-    logger.info(f"[test/embed-and-store] stored row id: {row.id}")
+    logger.info("[test/embed-and-store] stored row id: %s", row.id)
 
     return {
         "text": body.text,
@@ -71,23 +81,33 @@ async def test_embed_and_store(
         "vector_length": len(vector),
     }
 
-@router.get("/redis-cache")
 async def get_redis_cache(
     redis_client: aioredis.Redis = Depends(get_redis_client),
 ):
     """
     Returns all key-value pairs currently stored in Redis.
+    Uses SCAN instead of KEYS (non-blocking on large keyspaces), batches values
+    via chunked MGETs issued concurrently, and decodes JSON off the event loop.
     """
-    keys = await redis_client.keys("*")
+    keys = [key async for key in redis_client.scan_iter(match="*", count=1000)]
     if not keys:
         return {"count": 0, "entries": {}}
 
-    values = await redis_client.mget(*keys)
-    entries = {
-        key: json.loads(value) if value else None
-        for key, value in zip(keys, values)
-    }
-    logger.info(f"Returning {len(entries)} cached entries")
+    # chunked MGETs run concurrently: ~ceil(N/chunk) round trips instead of one giant reply
+    chunks = [keys[i:i + _MGET_CHUNK_SIZE] for i in range(0, len(keys), _MGET_CHUNK_SIZE)]
+    value_lists = await asyncio.gather(*[redis_client.mget(*chunk) for chunk in chunks])
+    values = [value for chunk_values in value_lists for value in chunk_values]
+
+    # JSON decode is CPU-bound for large caches; chunk it across worker threads —
+    # orjson drops the GIL mid-parse, so the chunks decode on multiple cores
+    value_chunks = [values[i:i + _DECODE_CHUNK_SIZE] for i in range(0, len(values), _DECODE_CHUNK_SIZE)]
+    decoded_chunks = await asyncio.gather(*[
+        asyncio.to_thread(lambda chunk=chunk: [orjson.loads(value) if value else None for value in chunk])
+        for chunk in value_chunks
+    ])
+    # the client runs in bytes mode; only the keys need decoding for the JSON response
+    entries = dict(zip((key.decode() for key in keys), itertools.chain.from_iterable(decoded_chunks)))
+    logger.info("Returning %s cached entries", len(entries))
     return {"count": len(entries), "entries": entries}
 
 @router.get("/retrieve-reranked")
@@ -97,13 +117,13 @@ async def test_retrieve_reranked(
     retrieval_size: int = 50,
     memory: MemoryInterface = Depends(get_memory_retriever),
 ):
-    logger.info(f"[test/retrieve-reranked] query='{query}', limit={limit}, retrieval_size={retrieval_size}")
+    logger.info("[test/retrieve-reranked] query='%s', limit=%s, retrieval_size=%s", query, limit, retrieval_size)
 
     start = time.perf_counter()
     results = await memory.retrieve_and_rerank(query=query, limit=limit, retrieval_size=retrieval_size)
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    logger.info(f"total elapsed time: {round(elapsed_ms, 2)}")
+    logger.info("total elapsed time: %.2f", elapsed_ms)
 
     return {
         "query": query,
@@ -112,7 +132,6 @@ async def test_retrieve_reranked(
         "elapsed_ms": round(elapsed_ms, 2),
     }
 
-@router.post("/clear-cache")
 async def clear_cache(
     redis_client: aioredis.Redis = Depends(get_redis_client),
     memory: MemoryInterface = Depends(get_memory_retriever),
@@ -130,4 +149,10 @@ async def clear_cache(
     logger.info("All cache layers cleared")
     return {"message": "All cache layers cleared"}
 
+# Redis debug routes are registered only when enabled — decided once at import,
+# so disabled deployments keep the routing trie (and the OpenAPI schema) smaller
+if get_service_settings().REDIS_CACHE_ENABLED:
+    router.add_api_route("/redis-cache", get_redis_cache, methods=["GET"])
+    router.add_api_route("/clear-cache", clear_cache, methods=["POST"])
+
 # TODO: make redis cache client wrapper to save/load easily
@@ -16,10 +16,19 @@ class SessionIdFilter(logging.Filter):
     """
     A logging filter that injects the correlation_id from the context variable
     into the log record.
+    NOTE: runs for every record on every logger — kept as cheap as possible.
+    Request handlers that log heavily can use the per-request LoggerAdapter set
+    by LoggingMiddleware (request.state.logger), which supplies session_id via
+    'extra' and skips the ContextVar lookup; this filter still covers background
+    tasks and library records.
     """
+    # bind the getter once instead of resolving session_id_var.get per record
+    _get_session_id = staticmethod(session_id_var.get)
+
     def filter(self, record):
-        # Retrieve the ID from the context variable and add it to the log record
-        record.session_id = session_id_var.get() or "N/A" # Default to N/A if not set
+        # adapter-provided records already carry session_id; don't overwrite it
+        if not hasattr(record, "session_id"):
+            record.session_id = self._get_session_id() or "N/A" # Default to N/A if not set
         return True
 
 def get_session_id() -> str:
@@ -0,0 +1,55 @@
+# bounded top-k selection over score arrays
+# numba-JIT single-pass kernel when numba is installed (cache=True so the
+# compile cost is paid once per machine); numpy argpartition fallback otherwise
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    # no fastmath: it lets LLVM assume no infinities, which is undefined against
+    # the -inf sentinels below — and the kernel is comparison-bound anyway
+    @njit(cache=True)
+    def _topk_numba(scores, k): # pragma: no cover - compiled
+        # single pass keeping the k best seen so far in a bounded buffer;
+        # O(n*k) but k is small (retrieval limits), no allocation per element
+        best_scores = np.full(k, -np.inf, dtype=np.float32)
+        best_idx = np.full(k, -1, dtype=np.int64)
+        min_pos = 0
+        for i in range(scores.shape[0]):
+            s = scores[i]
+            if s > best_scores[min_pos]:
+                best_scores[min_pos] = s
+                best_idx[min_pos] = i
+                # track which slot now holds the smallest retained score
+                min_pos = 0
+                for j in range(1, k):
+                    if best_scores[j] < best_scores[min_pos]:
+                        min_pos = j
+        order = np.argsort(-best_scores)
+        out = best_idx[order]
+        return out[out >= 0]
+
+    # pre-warm so the JIT compile (or on-disk cache load) happens at import, not on the first request
+    _topk_numba(np.zeros(1, dtype=np.float32), 1)
+else:
+    _topk_numba = None
+
+def topk(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the indices of the k largest scores, in descending score order.
+    Uses the numba kernel when available, otherwise numpy argpartition
+    (O(n + k log k) instead of a full O(n log n) sort).
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= scores.size:
+        return np.argsort(-scores)
+    if _topk_numba is not None:
+        return _topk_numba(scores, k)
+    idx = np.argpartition(-scores, k)[:k]
+    return idx[np.argsort(-scores[idx])]
@@ -3,7 +3,6 @@
 
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from functools import lru_cache
 from pydantic import Field
 
 # explicitly locate env file
@@ -15,8 +14,9 @@ class ServiceSettings(BaseSettings):
     """
 
     # default setting with env file path
+    # frozen=True: settings never change after startup, lets pydantic skip mutation checks
     model_config = SettingsConfigDict(
-        env_file=_ENV_FILE, env_file_encoding="utf-8", extra="ignore"
+        env_file=_ENV_FILE, env_file_encoding="utf-8", extra="ignore", frozen=True
     )
 
     # auto parsed fields from .env
@@ -34,11 +34,22 @@ class ServiceSettings(BaseSettings):
 
     # gemini
     GEMINI_API_KEY: str
+    # embedding dimensionality requested from Gemini (Matryoshka-style truncation).
+    # Smaller dims shrink network bytes, Redis payloads, cosine FLOPs and pgvector
+    # index size roughly linearly; must match the dimension the DB tables were
+    # created with (db.model reads the same env var).
+    EMBEDDING_DIM: int = Field(default=1536, description="Embedding output dimensionality; pgvector indexes support up to 2000 dims.")
 
     # redis
     REDIS_URL: str = Field(default="redis://localhost:6379")
 
-# lru cache to return service setting instance
-@lru_cache()
+    # feature flags
+    REDIS_CACHE_ENABLED: bool = Field(default=True, description="Registers the /test/redis-cache and /test/clear-cache debug routes.")
+    SEMANTIC_CACHE_REDIS_ENABLED: bool = Field(default=False, description="Backs the L3 semantic cache with Redis VSS (requires the RediSearch module); falls back to the in-process ring when unavailable.")
+
+# resolve settings once at import time: the .env parse happens exactly once per process
+# and every Depends path returns the same frozen instance without a cache lookup
+SETTINGS: ServiceSettings = ServiceSettings() # type: ignore
+
 def get_service_settings() -> ServiceSettings:
-    return ServiceSettings() # type: ignore
+    return SETTINGS
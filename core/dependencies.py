@@ -4,6 +4,7 @@ from fastapi import Request, Depends
 import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncEngine
 from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
+from models.embeddings.batched_embedder import BatchedEmbedder
 from memory_interface import MemoryInterface
 from memory_interface_extended import ExtendedMemoryInterface
 from models.reranker.cross_encoder import CEReranker
@@ -21,6 +22,12 @@ def get_gemini_text_embedding_client(request: Request) -> GenAITextEmbeddingClie
     """
     return request.app.state.gemini_text_embedding_client
 
+def get_batched_embedder(request: Request) -> BatchedEmbedder:
+    """
+    FastAPI dependency to get the shared batched embedder from the application state.
+    """
+    return request.app.state.batched_embedder
+
 def get_memory_retriever(request: Request) -> MemoryInterface:
     """
     FastAPI dependency to get the shared MemoryInterface instance from the application state.
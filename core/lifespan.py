@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager, AsyncExitStack
 from fastapi import FastAPI
 import redis.asyncio as aioredis
@@ -5,6 +6,7 @@ from core.config import get_service_settings
 from common.logger import logger
 from db.session import create_db_engine_context, parse_db_settings_from_service, DBSettings, DBType
 from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
+from models.embeddings.batched_embedder import BatchedEmbedder
 from models.reranker.cross_encoder import CEReranker
 from memory_interface import MemoryInterface
 from memory_interface_extended import ExtendedMemoryInterface
@@ -45,19 +47,48 @@ async def lifespan(app: FastAPI):
         logger.info("Main database engine initialized.")
 
         # Text embedding models, for now only Google GenAI
-        gemini_text_embedding_client = GenAITextEmbeddingClient(api_key=settings.GEMINI_API_KEY)
+        gemini_text_embedding_client = GenAITextEmbeddingClient(
+            embedding_size=settings.EMBEDDING_DIM, api_key=settings.GEMINI_API_KEY
+        )
         app.state.gemini_text_embedding_client = gemini_text_embedding_client
         logger.info(f"Text embedding client (GOOGLE GENAI) initialized.")
 
+        # warm the embedding client: opens the HTTP/TLS session now so the first
+        # real request doesn't pay the cold-start cliff; never fails startup
+        try:
+            await gemini_text_embedding_client.aembed_text(["warmup"], task_type="RETRIEVAL_DOCUMENT")
+            logger.info("Embedding client warmed up.")
+        except Exception as exc:
+            logger.warning(f"Embedding client warmup failed (continuing startup): {exc}")
+
+        # Batched embedder: coalesces concurrent embed requests into one API call
+        batched_embedder = BatchedEmbedder(embedding_client=gemini_text_embedding_client)
+        batched_embedder.start()
+        app.state.batched_embedder = batched_embedder
+        logger.info(f"Batched embedder initialized.")
+
         # Redis client for persistent cache
-        # TODO: to be made into a redis client
-        redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        # explicit bounded pool: the default pool is unbounded and opens new
+        # connections on contention, causing handshake spikes under burst load
+        redis_pool = aioredis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=64,
+            # bytes mode: skip the per-value UTF-8 decode/copy on every GET/MGET;
+            # json.loads accepts bytes directly and binary payloads stay possible
+            decode_responses=False,
+            socket_keepalive=True,
+            health_check_interval=30, # preempt stale connections before a request hits them
+        )
+        redis_client = aioredis.Redis(connection_pool=redis_pool)
         app.state.redis_client = redis_client
+        stack.push_async_callback(redis_pool.disconnect)
         stack.push_async_callback(redis_client.aclose)
         logger.info(f"Redis client initialized at {settings.REDIS_URL}.")
 
         # Cross encoder reranker
-        cross_encoder_reranker = CEReranker() # model is downloaded locally, no need to register any APIs
+        # loading torch weights blocks for hundreds of ms to seconds; run it in a
+        # worker thread so the event loop stays free for the rest of startup I/O
+        cross_encoder_reranker = await asyncio.to_thread(CEReranker) # model is downloaded locally, no need to register any APIs
         app.state.cross_encoder_reranker = cross_encoder_reranker
         logger.info(f"Cross encoder reranker initialized.")
 
@@ -66,9 +97,14 @@ async def lifespan(app: FastAPI):
             main_db_engine=app.state.main_db_engine,
             embedding_client=gemini_text_embedding_client,
             redis_client=redis_client,
-            cross_encoder_reranker=cross_encoder_reranker
+            cross_encoder_reranker=cross_encoder_reranker,
+            batched_embedder=batched_embedder,
+            use_redis_semantic_cache=settings.SEMANTIC_CACHE_REDIS_ENABLED,
         )
         app.state.memory_retriever = memory_retriever
+        # prewarm the L1 exact cache from the hottest Redis keys in the background
+        # so a fresh replica doesn't cold-start on queries the fleet already caches
+        memory_retriever.start_cache_prewarm()
         logger.info(f"Memory retriever initialized.")
 
         # Extended memory retriever: warm-buffer write path + ground-truth validation
@@ -77,8 +113,11 @@ async def lifespan(app: FastAPI):
             embedding_client=gemini_text_embedding_client,
             redis_client=redis_client,
             cross_encoder_reranker=cross_encoder_reranker,
+            batched_embedder=batched_embedder,
+            use_redis_semantic_cache=settings.SEMANTIC_CACHE_REDIS_ENABLED,
         )
         extended_memory_retriever.start_periodic_flush(_WARM_BUFFER_FLUSH_INTERVAL_SECONDS)
+        extended_memory_retriever.start_cache_prewarm()
         app.state.extended_memory_retriever = extended_memory_retriever
         logger.info(
             f"Extended memory retriever initialized "
@@ -94,6 +133,7 @@ async def lifespan(app: FastAPI):
             # TODO: add any explicit cleanup / shutdown code here
             await extended_memory_retriever.flush_warm_buffer() # flushes to managed vector db before shutdown to avoid data loss, keeps ground truth in sync
             await extended_memory_retriever.stop_periodic_flush()
+            await batched_embedder.stop()
 
         # The AsyncExitStack will automatically call the __aexit__ or registered cleanup
         # methods for all resources entered or pushed to it, in reverse order.
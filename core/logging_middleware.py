@@ -1,8 +1,9 @@
+import logging
 import uuid
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import Response
-from common.logger import session_id_var
+from common.logger import logger, session_id_var
 
 class LoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(
@@ -16,7 +17,13 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         # Generate a unique ID for the request
         request_id = str(uuid.uuid4())
         session_id_var.set(f"request_id:{request_id}")
-        
+
+        # Per-request adapter: injects session_id via 'extra' once, so handlers
+        # that log many lines skip the per-record ContextVar lookup in the filter
+        request.state.logger = logging.LoggerAdapter(
+            logger, {"session_id": f"request_id:{request_id}"}
+        )
+
         # Process the request
         response = await call_next(request)
         
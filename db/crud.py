@@ -1,24 +1,44 @@
 # CRUD operations on the vector db
+import numpy as np
+
 from db.model import VectorDB, VectorDBManaged, GroundTruth
 from db.session import get_async_session_maker
 
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, delete, update, insert, text, bindparam
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-async def find_similar(query_vector: list[float], engine: AsyncEngine, limit: int = 5) -> list[str]:
+# HNSW candidate-list floor for similarity queries (the pgvector default).
+# Sized per call as max(floor, limit): the HNSW scan returns at most ef_search
+# rows, so any limit above it would silently cap the result set — and the
+# fetch_rs bookkeeping upstream would misread that as DB exhaustion.
+# Set per-transaction via SET LOCAL so the planner picks the index scan over a seq scan.
+_HNSW_EF_SEARCH_FLOOR = 40
+
+# compiled once at import: the query shape never changes, only the vector/limit binds do,
+# so per-call expression construction + compilation drops out of the hot path
+_FIND_SIMILAR_STMT = (
+    select(VectorDB.text)
+    .order_by(VectorDB.vector.cosine_distance(bindparam("query_vector", type_=VectorDB.vector.type)))
+    .limit(bindparam("limit_count"))
+)
+
+async def find_similar(query_vector: list[float] | np.ndarray, engine: AsyncEngine, limit: int = 5) -> list[str]:
     """
     Returns the text of the top-k most similar vectors to query_vector, ranked by cosine similarity.
+    Pins hnsw.ef_search for the transaction so the query uses the HNSW index (graph traversal)
+    instead of falling back to a full sequential scan.
+    Executes the precompiled module-level statement with per-call bind params.
     """
     async with get_async_session_maker(engine)() as session:
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {max(_HNSW_EF_SEARCH_FLOOR, limit)}"))
         result = await session.execute(
-            select(VectorDB.text)
-            .order_by(VectorDB.vector.cosine_distance(query_vector))
-            .limit(limit)
+            _FIND_SIMILAR_STMT,
+            {"query_vector": query_vector, "limit_count": limit},
         )
     return [row.text for row in result.all()]
 
 async def find_similar_extended(
-    query_vector: list[float], engine: AsyncEngine, limit: int, offset: int = 0
+    query_vector: list[float] | np.ndarray, engine: AsyncEngine, limit: int, offset: int = 0
 ) -> list[dict]:
     """
     Queries VectorDBManaged and returns dicts with {id, text, ground_truth_id} for each result.
@@ -39,7 +59,7 @@ async def find_similar_extended(
         for row in result.all()
     ]
 
-async def store_vector(vector: list[float], text: str, engine: AsyncEngine) -> VectorDB:
+async def store_vector(vector: list[float] | np.ndarray, text: str, engine: AsyncEngine) -> VectorDB:
     """
     Takes a text string and its vector embedding and stores it in the vector db.
     ground_truth_id is left NULL (legacy direct-store path; always treated as valid on retrieval).
@@ -51,6 +71,24 @@ async def store_vector(vector: list[float], text: str, engine: AsyncEngine) -> V
         await session.refresh(obj)
     return obj
 
+async def store_vectors_bulk(pairs: list[tuple[str, list[float]]], engine: AsyncEngine) -> int:
+    """
+    Bulk variant of store_vector for bursts of embeddings (e.g. a flushed embed batch).
+    Takes (text, vector) pairs and inserts them as one multi-row INSERT with a single
+    commit — one fsync per batch instead of one per row.
+    ground_truth_id is left NULL like store_vector (legacy direct-store path).
+    Returns the number of rows inserted.
+    """
+    if not pairs:
+        return 0
+    async with get_async_session_maker(engine)() as session:
+        await session.execute(
+            insert(VectorDB),
+            [{"text": row_text, "vector": row_vector} for row_text, row_vector in pairs],
+        )
+        await session.commit()
+    return len(pairs)
+
 async def create_ground_truth(text: str, engine: AsyncEngine) -> GroundTruth:
     """
     Creates a new GroundTruth row with is_synced=False.
@@ -0,0 +1,37 @@
+# shared synchronous engine for the one-off scripts and manual DB tests
+# Each test script used to build its own create_engine(MAIN_DB_URL) with the
+# default (unsized) pool, paying a fresh TLS handshake (sslmode=require,
+# ~100-300 ms against Supabase) on every invocation. Importing the module-scope
+# engine/Session here makes connections pooled and reused instead.
+
+from dotenv import load_dotenv
+from pathlib import Path
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+
+MAIN_DB_USER = os.getenv("MAIN_DB_USER")
+MAIN_DB_PW = os.getenv("MAIN_DB_PW")
+MAIN_DB_HOST = os.getenv("MAIN_DB_HOST")
+MAIN_DB_PORT = os.getenv("MAIN_DB_PORT")
+MAIN_DB_NAME = os.getenv("MAIN_DB_NAME")
+
+MAIN_DB_URL = f"postgresql+psycopg2://{MAIN_DB_USER}:{MAIN_DB_PW}@{MAIN_DB_HOST}:{MAIN_DB_PORT}/{MAIN_DB_NAME}?sslmode=require"
+
+engine = create_engine(
+    MAIN_DB_URL,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True, # drop dead connections before a query trips over them
+    # fold executemany parameter sets into multi-row VALUES (and batch the rest):
+    # bulk inserts become one round trip instead of one per row
+    executemany_mode="values_plus_batch",
+    # TCP keepalives so idle pooled connections survive NAT/load-balancer timeouts
+    connect_args={"keepalives": 1, "keepalives_idle": 30},
+)
+
+# expire_on_commit=False: scripts read attributes after commit without a re-fetch
+Session = sessionmaker(engine, expire_on_commit=False)
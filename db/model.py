@@ -1,10 +1,22 @@
 # baseline ORM model for the vector db table using SQLAlchemy
+import os
+from pathlib import Path
+from dotenv import load_dotenv
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy import String, Text, DateTime, Index, Column, Integer, Boolean, ForeignKey
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 from datetime import datetime
 from typing import Optional
 
+# embedding dimensionality for the vector columns; read from the env with the
+# project .env loaded here, at import time — pydantic-settings parses .env
+# without exporting to os.environ, and script-level load_dotenv calls run after
+# this module is imported, so neither would reach the getenv below. Not
+# core.config: the table-management scripts import this module without a full
+# service .env. Must match EMBEDDING_DIM used by the embedding client.
+load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1536"))
+
 # A dedicated Base for all models that map to tables in the main database.
 class MainDB_Base(DeclarativeBase):
     pass
@@ -32,10 +44,11 @@ class VectorDB(MainDB_Base):
     """
     Simple vector db table, used to experiment with semantic retrieval.
     Legacy direct-store path — no ground-truth tracking.
+    Stored as halfvec (FP16): halves row + HNSW index bytes vs FP32 with negligible recall loss.
     """
     __tablename__ = "vector_db"
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    vector = Column(Vector(1536), nullable=False)
+    vector = Column(HALFVEC(EMBEDDING_DIM), nullable=False)
     text = Column(Text, nullable=False)
 
     # index for faster similarity search, NOTE: only on cosine similarity for now
@@ -45,7 +58,7 @@ class VectorDB(MainDB_Base):
             "vector",
             postgresql_using="hnsw",
             postgresql_with={"m": 16, "ef_construction": 64},
-            postgresql_ops={"vector": "vector_cosine_ops"},
+            postgresql_ops={"vector": "halfvec_cosine_ops"},
         ),
     )
 
@@ -54,10 +67,11 @@ class VectorDBManaged(MainDB_Base):
     Managed vector DB table for the warm-buffer write path.
     Every row is linked to a GroundTruth row via non-nullable ground_truth_id.
     Valid only after the corresponding GroundTruth row has is_synced=True (set on flush).
+    Stored as halfvec (FP16) like VectorDB: halves row + HNSW index bytes vs FP32.
     """
     __tablename__ = "vector_db_managed"
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    vector = Column(Vector(1536), nullable=False)
+    vector = Column(HALFVEC(EMBEDDING_DIM), nullable=False)
     text = Column(Text, nullable=False)
     ground_truth_id = Column(Integer, ForeignKey("ground_truth.id"), nullable=False, index=True)
 
@@ -68,6 +82,6 @@ class VectorDBManaged(MainDB_Base):
             "vector",
             postgresql_using="hnsw",
             postgresql_with={"m": 16, "ef_construction": 64},
-            postgresql_ops={"vector": "vector_cosine_ops"},
+            postgresql_ops={"vector": "halfvec_cosine_ops"},
         ),
     )
@@ -1,5 +1,13 @@
 # main FastAPI app
 
+# install uvloop before anything touches the event loop: ~2x lower per-await
+# overhead for the I/O-bound retrieve paths (no-op where uvloop isn't installed)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Any, Optional, Dict
@@ -1,28 +1,250 @@
 # the main memory retrieval interface
-import json
+import asyncio
+import hashlib
+import orjson
 import numpy as np
-from collections import deque, OrderedDict
+from cachetools import LRUCache
+from collections import OrderedDict
+from uuid import uuid4
 import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncEngine
 from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
+from models.embeddings.batched_embedder import BatchedEmbedder
 from models.reranker.cross_encoder import CEReranker
 from db.crud import find_similar
 from typing import Optional
 from common.logger import logger
+from common.simscan import scan_scores
 from common.timer import async_timer
 
+class SemanticCacheRing:
+    """
+    Fixed-capacity ring buffer backing the L3 semantic cache.
+    Cached query vectors are L2-normalized and int8-quantized (scaled by 127)
+    into one contiguous (capacity, dim) matrix, with payloads
+    (results, reranked_bool, fetch_rs) in a parallel list — structure-of-arrays,
+    so a lookup scores every cached entry with a single matrix-vector product
+    instead of a per-entry Python loop that re-normalizes and re-allocates both
+    sides. int8 rows are 4x smaller than float32 (1.5 KB vs 6 KB at dim=1536),
+    keeping the whole matrix resident in L1/L2 cache; for unit vectors compared
+    against a 0.70 threshold the quantization error is negligible.
+    The matrix is allocated lazily on first insert (the embedding dim is only
+    known then) and slots are overwritten oldest-first once full.
+    """
+
+    _QUANT_SCALE = 127 # int8 quantization scale for unit-norm components
+
+    def __init__(self, capacity: int = 10):
+        self._capacity = capacity
+        self._matrix: Optional[np.ndarray] = None # (capacity, dim) int8, quantized unit-norm rows
+        self._payloads: list[Optional[tuple[list[str], bool, int]]] = [None] * capacity
+        self._count = 0
+        self._head = 0 # next slot to overwrite
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, entry: tuple[np.ndarray, list[str], bool, int]) -> None:
+        """
+        Inserts a (query_vector, results, reranked_bool, fetch_rs) entry,
+        normalizing and int8-quantizing the vector once here so lookups are pure
+        integer dot products. Overwrites the oldest slot when at capacity (FIFO,
+        like the old deque).
+        """
+        vector, results, reranked, fetch_rs = entry
+        row = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(row)
+        if norm:
+            row = row / norm
+        if self._matrix is None:
+            self._matrix = np.empty((self._capacity, row.shape[0]), dtype=np.int8)
+        self._matrix[self._head] = np.round(row * self._QUANT_SCALE).astype(np.int8)
+        self._payloads[self._head] = (results, reranked, fetch_rs)
+        self._head = (self._head + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+
+    def find_best(
+        self, query_vector: np.ndarray, rerank: bool, size_needed: int, threshold: float
+    ) -> Optional[list[str]]:
+        """
+        Returns the results of the first eligible entry (scanning newest-first)
+        whose similarity clears the threshold, or None. Workloads show temporal
+        locality — the most recently cached vector is by far the likeliest hit —
+        so the recency-ordered scan early-exits after ~1 payload check on hot
+        workloads instead of always walking all slots for the global best.
+        A hit is moved into the most-recent slot, so the FIFO overwrite reaches
+        frequently-hit entries last (LRU-style protection).
+        Eligibility rules match the old deque scan: reranked flag must match, and
+        the entry must have enough results (or the DB must have been exhausted at
+        fetch time).
+        """
+        if self._count == 0 or self._matrix is None:
+            return None
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0.0:
+            return None # guard zero vectors (possible with test inputs)
+        # one integer scan over all cached rows; both sides are quantized unit
+        # vectors, so scores approximate the cosine (see common.simscan — numba
+        # kernel when available, numpy int32 GEMV otherwise)
+        quantized = np.round((query / norm) * self._QUANT_SCALE).astype(np.int8)
+        scores = scan_scores(self._matrix[:self._count], quantized, self._QUANT_SCALE)
+
+        for offset in range(1, self._count + 1):
+            i = (self._head - offset) % self._capacity
+            if float(scores[i]) < threshold:
+                continue
+            results, cached_reranked, fetch_rs = self._payloads[i] # type: ignore[misc] # filled slots
+            if cached_reranked != rerank:
+                continue
+            db_exhausted = fetch_rs >= size_needed and len(results) < fetch_rs
+            if len(results) < size_needed and not db_exhausted:
+                continue
+            self._touch(i)
+            return results
+        return None
+
+    def _touch(self, index: int) -> None:
+        """
+        Swaps a hit entry into the most-recent slot so the oldest-first overwrite
+        reaches it last. Keeps matrix rows and payloads in lockstep.
+        """
+        newest = (self._head - 1) % self._capacity
+        if index == newest or self._matrix is None:
+            return
+        self._matrix[[index, newest]] = self._matrix[[newest, index]]
+        self._payloads[index], self._payloads[newest] = self._payloads[newest], self._payloads[index]
+
+    def clear(self) -> None:
+        self._count = 0
+        self._head = 0
+        self._payloads = [None] * self._capacity
+
+class RedisSemanticCache:
+    """
+    Optional Redis-VSS-backed L3 semantic cache (RediSearch FT.* commands).
+    Compared to the in-process ring it is shared across replicas, survives
+    restarts, and scales far past 10 entries with sublinear HNSW lookups — one
+    FT.SEARCH KNN round trip per check.
+    Entries are hashes under semcache:{uuid} holding the float32 vector bytes, a
+    plain/reranked namespace tag (so the KNN search never crosses namespaces),
+    and the orjson payload with results + fetch_rs.
+    The index is created lazily on first use; if the search module is missing the
+    cache disables itself and the caller falls back to the in-process ring.
+    """
+
+    _INDEX_NAME = "idx:semcache"
+    _KEY_PREFIX = "semcache:"
+
+    def __init__(self, redis_client: aioredis.Redis, dim: int):
+        self.redis_client = redis_client
+        self._dim = dim
+        self._ready = False
+        self._disabled = False
+
+    async def _ensure_index(self) -> bool:
+        """Creates the HNSW vector index once; disables the cache if Redis lacks RediSearch."""
+        if self._ready:
+            return True
+        if self._disabled:
+            return False
+        try:
+            await self.redis_client.execute_command(
+                "FT.CREATE", self._INDEX_NAME, "ON", "HASH",
+                "PREFIX", "1", self._KEY_PREFIX,
+                "SCHEMA",
+                "ns", "TAG",
+                "v", "VECTOR", "HNSW", "6", "TYPE", "FLOAT32",
+                "DIM", str(self._dim), "DISTANCE_METRIC", "COSINE",
+            )
+        except aioredis.ResponseError as exc:
+            if "already exists" not in str(exc).lower():
+                self._disabled = True
+                logger.warning(f"[L3 redis] vector index unavailable, using in-process ring only: {exc}")
+                return False
+        except Exception as exc:
+            self._disabled = True
+            logger.warning(f"[L3 redis] vector index unavailable, using in-process ring only: {exc}")
+            return False
+        self._ready = True
+        return True
+
+    async def append(self, vector: np.ndarray, results: list[str], reranked: bool, fetch_rs: int) -> None:
+        if not await self._ensure_index():
+            return
+        key = f"{self._KEY_PREFIX}{uuid4().hex}"
+        await self.redis_client.hset(key, mapping={
+            "ns": "reranked" if reranked else "plain",
+            "v": np.asarray(vector, dtype=np.float32).tobytes(),
+            "payload": orjson.dumps({"results": results, "fetch_rs": fetch_rs}),
+        })
+
+    async def find_best(
+        self, query_vector: np.ndarray, rerank: bool, size_needed: int, threshold: float
+    ) -> Optional[list[str]]:
+        """
+        KNN-1 lookup within the matching namespace; returns the cached results if
+        the nearest entry clears the similarity threshold and the same
+        size/DB-exhaustion eligibility rules as the in-process ring, else None.
+        """
+        if not await self._ensure_index():
+            return None
+        ns = "reranked" if rerank else "plain"
+        try:
+            reply = await self.redis_client.execute_command(
+                "FT.SEARCH", self._INDEX_NAME,
+                f"(@ns:{{{ns}}})=>[KNN 1 @v $vec AS dist]",
+                "PARAMS", "2", "vec", np.asarray(query_vector, dtype=np.float32).tobytes(),
+                "RETURN", "2", "payload", "dist",
+                "DIALECT", "2",
+            )
+        except Exception as exc:
+            logger.warning(f"[L3 redis] lookup failed: {exc}")
+            return None
+        # reply layout: [total, key, [field, value, ...], ...] (bytes-mode client)
+        if not reply or not reply[0] or len(reply) < 3:
+            return None
+        fields = dict(zip(reply[2][::2], reply[2][1::2]))
+        similarity = 1.0 - float(fields.get(b"dist", 1.0))
+        if similarity < threshold:
+            return None
+        payload = orjson.loads(fields[b"payload"])
+        results, fetch_rs = payload["results"], payload["fetch_rs"]
+        db_exhausted = fetch_rs >= size_needed and len(results) < fetch_rs
+        if len(results) < size_needed and not db_exhausted:
+            return None
+        return results
+
+class _ExactCache(LRUCache):
+    """
+    L1 LRU with eviction cleanup: when an entry falls off the end, its companion
+    _cache_fetch_sizes record is dropped too, so that dict stays bounded.
+    Everything else is stock cachetools.LRUCache — C-backed, one operation per
+    insert, and __getitem__/get promote on hit (no separate move_to_end call).
+    """
+
+    def __init__(self, maxsize: int, fetch_sizes: dict[str, int]):
+        super().__init__(maxsize=maxsize)
+        self._fetch_sizes = fetch_sizes
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._fetch_sizes.pop(key, None)
+        return key, value
+
 class MemoryInterface:
     """
     Wraps the embedding client and vector db to retrieve semantically similar text.
     Caches:
-    1. Exact match cache - skips embedding client entirely on identical query texts (LRU via OrderedDict, max 50)
-    2. Semantic cache — skips db retrieval if a sufficiently similar query was seen before (FIFO deque, max 10)
+    1. Exact match cache - skips embedding client entirely on identical query texts (LRU via cachetools, max 50)
+    2. Semantic cache — skips db retrieval if a sufficiently similar query was seen before (FIFO ring buffer, max 10)
 
     NOTE:
-    - semantic cache deque stores (vector, results, reranked_bool, fetch_rs) tuples
+    - semantic cache entries carry (vector, results, reranked_bool, fetch_rs); vectors are
+      kept unit-normalized in one contiguous matrix (see SemanticCacheRing)
         - reranked_bool prevents cross-contamination between plain and reranked entries
         - fetch_rs is the retrieval_size/limit used in the DB fetch (for DB exhaustion detection, same logic as L1/L2)
-    - L1/L2 cache keys are namespaced: plain::{query} and reranked::{query}
+    - L1/L2 cache keys are namespaced and hashed: mi:plain:{sha256(query)} and mi:reranked:{sha256(query)}
         - upward compatible: len(cached) >= size_needed check allows larger cached entries to serve smaller requests
         - on miss due to insufficient size, DB re-fetch overwrites the entry with the larger result set
     (Edge case for small retrieval documents size):
@@ -31,78 +253,277 @@ class MemoryInterface:
         - if original_fetch_rs >= retrieval_size and len(cached) < original_fetch_rs, DB was exhausted, then serve from cache
     """
 
-    def __init__(self, embedding_client: GenAITextEmbeddingClient, main_db_engine: AsyncEngine, redis_client: aioredis.Redis, cross_encoder_reranker: CEReranker):
+    # sorted set in Redis ranking cache keys by population count; read back at
+    # startup to prewarm the L1 exact cache (see warm_from_redis)
+    _HOTKEYS_KEY = "mi:hotkeys"
+    _HOTKEYS_MAX = 1024 # zset cap; trimmed down to the top-scored members
+    _HOTKEYS_TRIM_EVERY = 1000 # bumps between ZREMRANGEBYRANK trims
+
+    def __init__(
+        self,
+        embedding_client: GenAITextEmbeddingClient,
+        main_db_engine: AsyncEngine,
+        redis_client: aioredis.Redis,
+        cross_encoder_reranker: CEReranker,
+        batched_embedder: Optional[BatchedEmbedder] = None,
+        use_redis_semantic_cache: bool = False,
+    ):
         # clients/engines
         self.embedding_client = embedding_client
         self.main_db_engine = main_db_engine
         self.redis_client = redis_client
         self.cross_encoder_reranker = cross_encoder_reranker
+        # optional micro-batching layer: when set, query embeddings from concurrent
+        # DIFFERENT queries coalesce into one batched API call (the single-flight
+        # map already covers concurrent identical queries)
+        self.batched_embedder = batched_embedder
         # caches and cache settings
-        self._exact_cache: OrderedDict[str, list[str]] = OrderedDict() # L1: in-memory LRU
-        self._semantic_cache: deque[tuple[list[float], list[str], bool, int]] = deque(maxlen=10) # (query_vector, results, reranked_bool, fetch_rs)
+        self._exact_cache_max = 50 # threshold for max number of items in exact query cache
         self._cache_fetch_sizes: dict[str, int] = {} # cache_key -> retrieval_size used in last DB fetch (for DB exhaustion detection)
+        self._exact_cache: LRUCache = _ExactCache(self._exact_cache_max, self._cache_fetch_sizes) # L1: in-memory LRU
+        self._semantic_cache = SemanticCacheRing(capacity=10) # L3: (query_vector, results, reranked_bool, fetch_rs)
+        # optional shared L3 via Redis VSS; checked before the ring, and the ring
+        # keeps serving (and the flag degrades gracefully) if RediSearch is absent
+        self._redis_semantic_cache: Optional[RedisSemanticCache] = (
+            RedisSemanticCache(redis_client, embedding_client.embedding_size)
+            if use_redis_semantic_cache else None
+        )
+        # query -> unit-normed query vector; queries repeat far more often than their
+        # results stay in L1, so this skips the Gemini round trip on re-asked queries
+        self._query_vec_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        # single-flight map: query -> in-flight embedding Future, so N concurrent
+        # requests for the same (uncached) query share one API call
+        self._inflight_embeds: dict[str, asyncio.Future] = {}
+        # strong refs to in-flight background cache writes (asyncio only holds weak ones)
+        self._bg_tasks: set[asyncio.Task] = set()
         self._cosine_similarity_threshold = 0.70 # threshold for semantic cache
-        self._exact_cache_max = 50 # threshold for max number of items in exact query cache
+        self._query_vec_cache_max = 512 # vectors are small (6KB each), so this cache can be much larger than L1
+        # widened fetch size for plain-retrieve misses: one slightly bigger DB scan
+        # seeds the (limit-less) cache keys for every future limit <= this value
+        self._min_fetch_limit = 32
+        # cross-encoder budget: only the top-m ANN candidates get a model pass
+        self._rerank_top_m = 20
+        # bumps since the hotkeys zset was last trimmed (see _record_hotkey)
+        self._hotkey_bumps = 0
     
     # utils for caches below
     def _make_cache_key(self, query: str, namespace: str) -> str:
         """
         Simple helper to format the cache key for L1 and L2 caches.
         Namespace separates retrieve_plain ("plain") from retrieve_and_rerank ("reranked").
+        The query is SHA-256 hashed so keys stay a fixed 64 hex chars no matter how
+        long the question is — long queries no longer bloat Redis memory or the
+        per-request network bytes, and hashlib uses the CPU's SHA extensions so the
+        digest is effectively free. Identical queries still hash identically, so
+        exact-match semantics are unchanged.
         Neither limit nor retrieval_size is included — the len(cached) >= size_needed check at
         read time makes entries upward-compatible across different limit/retrieval_size values.
         """
-        return f"{namespace}::{query}"
+        return f"mi:{namespace}:{hashlib.sha256(query.encode()).hexdigest()}"
 
-    def _set_exact_cache(self, key: str, value: list[str], fetch_rs: int = 0) -> None:
+    def _set_exact_cache(self, key: str, value: list[str], fetch_rs: int = 0, record_hotkey: bool = True) -> None:
         """
         Insert or update an entry in the LRU exact cache, evicting the oldest entry if at capacity.
         fetch_rs: if provided, also updates _cache_fetch_sizes[key] for DB exhaustion detection.
-        On eviction, the corresponding _cache_fetch_sizes entry is cleaned up to prevent unbounded growth.
+        The LRUCache handles promotion and eviction in a single insert (and its
+        popitem override cleans up _cache_fetch_sizes for the evicted key).
+        Every population also bumps the key's hotness score, feeding the
+        startup prewarm (see warm_from_redis; the prewarm itself passes
+        record_hotkey=False so loading the top keys doesn't re-rank them).
         """
-        if key in self._exact_cache:
-            self._exact_cache.move_to_end(key)
         self._exact_cache[key] = value
         if fetch_rs:
             self._cache_fetch_sizes[key] = fetch_rs
-        if len(self._exact_cache) > self._exact_cache_max:
-            evicted_key, _ = self._exact_cache.popitem(last=False) # evict LRU
-            self._cache_fetch_sizes.pop(evicted_key, None)
+        if record_hotkey:
+            self._record_hotkey(key)
+
+    def _record_hotkey(self, cache_key: str) -> None:
+        """
+        Fire-and-forget ZINCRBY on the shared hotness zset. Population events
+        (L2/L3 promotions and DB misses) are frequent enough to rank keys without
+        taxing pure L1 hits with an extra Redis round trip each.
+        Every _HOTKEYS_TRIM_EVERY bumps, the zset is trimmed to its top
+        _HOTKEYS_MAX members — without that it would grow by one member per
+        distinct key ever populated.
+        """
+        task = asyncio.create_task(self.redis_client.zincrby(self._HOTKEYS_KEY, 1, cache_key))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_task_done)
+        self._hotkey_bumps += 1
+        if self._hotkey_bumps >= self._HOTKEYS_TRIM_EVERY:
+            self._hotkey_bumps = 0
+            trim = asyncio.create_task(
+                self.redis_client.zremrangebyrank(self._HOTKEYS_KEY, 0, -(self._HOTKEYS_MAX + 1))
+            )
+            self._bg_tasks.add(trim)
+            trim.add_done_callback(self._on_bg_task_done)
+
+    async def warm_from_redis(self, top_n: int = 50) -> int:
+        """
+        Prewarms the L1 exact cache from the hottest Redis keys, so a freshly
+        booted replica doesn't re-pay embed+DB for queries the fleet already
+        answers from cache (k replicas would otherwise waste k cold starts each).
+        Hotness ranking comes from the mi:hotkeys zset maintained by
+        _record_hotkey. Returns the number of entries loaded; failures only log —
+        prewarming is best-effort and never blocks startup.
+        """
+        try:
+            keys = await self.redis_client.zrange(self._HOTKEYS_KEY, 0, top_n - 1, desc=True)
+            if not keys:
+                return 0
+            values = await self.redis_client.mget(*keys)
+        except Exception as exc:
+            logger.warning(f"[cache prewarm] skipped: {exc}")
+            return 0
+        loaded = 0
+        for key, value in zip(keys, values):
+            if value is None:
+                continue # hot key expired/evicted from L2
+            cache_key = key.decode() if isinstance(key, bytes) else key
+            data = orjson.loads(value)
+            if isinstance(data, dict): # reranked payloads carry fetch_rs
+                self._set_exact_cache(cache_key, data["results"], fetch_rs=data["fetch_rs"], record_hotkey=False)
+            else:
+                self._set_exact_cache(cache_key, data, record_hotkey=False)
+            loaded += 1
+        logger.info(f"[cache prewarm] loaded {loaded} hot entries into L1")
+        return loaded
+
+    def start_cache_prewarm(self, top_n: int = 50) -> None:
+        """
+        Kicks warm_from_redis off as a background task; intended to be called
+        from lifespan right after construction so boot isn't gated on Redis.
+        """
+        task = asyncio.create_task(self.warm_from_redis(top_n))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_task_done)
+
+    async def warm(self, entries: dict[str, bytes | str]) -> int:
+        """
+        Bulk-populates the L2 Redis cache from pre-serialized entries in a single
+        pipelined round trip (vs one SET RTT per key). Intended for cold-cache
+        warmup on deploy, e.g. replaying a persisted top-queries snapshot.
+        Returns the number of entries written.
+        """
+        if not entries:
+            return 0
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, value in entries.items():
+                pipe.set(key, value)
+            await pipe.execute()
+        logger.info(f"[cache warmup] wrote {len(entries)} entries to Redis in one pipeline")
+        return len(entries)
 
-    def _cosine_similarity(self, a: list[float], b: list[float]) -> float:
+    def _set_redis_cache_bg(self, cache_key: str, payload: bytes) -> None:
+        """
+        Issues the L2 SET as a fire-and-forget background task. The write is pure
+        cache population — nothing downstream reads it in this request — so the
+        caller shouldn't pay its round trip before returning results.
+        A strong reference is kept until completion so the task isn't GC'd mid-flight.
         """
-        Simple helper to compute cosine similarity between two vectors using numpy.
-        NOTE: prevents zero-divisions; not likely in real scenarios (real embeddings), but possible when testing.
+        task = asyncio.create_task(self.redis_client.set(cache_key, payload))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_task_done)
+
+    def _on_bg_task_done(self, task: asyncio.Task) -> None:
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"[L2 cache] background SET failed: {task.exception()}")
+
+    async def _get_query_vector(self, query: str) -> Optional[np.ndarray]:
         """
-        va, vb = np.array(a), np.array(b)
-        norm_a, norm_b = np.linalg.norm(va), np.linalg.norm(vb)
-        if norm_a == 0.0 or norm_b == 0.0:
-            return 0.0
-        return float(np.dot(va, vb) / (norm_a * norm_b))
+        Returns the unit-normalized float32 embedding for a query, memoized in a
+        bounded LRU. The embedding API round trip dwarfs every other step of a
+        retrieval, and query texts repeat far more often than their results survive
+        the (much smaller) L1 cache — so a hit here turns an L1/L2-miss flow into a
+        pure semantic-cache/DB flow with no network call.
+        Concurrent misses on the same query are single-flighted: the first caller
+        issues the API call (in a worker thread, keeping the event loop free) and
+        the rest await the same Future — a cache-warming burst of N identical
+        queries costs one API call instead of N.
+        Returns None if the embedding client comes back empty.
+        NOTE: cosine distance is scale-invariant, so the normalized vector is passed
+        as-is to both the semantic cache and the vector DB.
+        """
+        cached = self._query_vec_cache.get(query)
+        if cached is not None:
+            self._query_vec_cache.move_to_end(query)
+            return cached
+
+        inflight = self._inflight_embeds.get(query)
+        if inflight is not None:
+            return await inflight
+
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._inflight_embeds[query] = fut
+        try:
+            if self.batched_embedder is not None:
+                # coalesce with other in-window queries into one batched API call
+                vector = await self.batched_embedder.embed(query, task_type="RETRIEVAL_QUERY")
+                embeddings = None if vector is None else [vector]
+            else:
+                # embed_text is a blocking HTTP call; run it off the event loop
+                embeddings = await loop.run_in_executor(
+                    None, lambda: self.embedding_client.embed_text([query], task_type="RETRIEVAL_QUERY")
+                )
+            # explicit None/length checks: embed_text now returns an ndarray,
+            # whose truthiness is ambiguous
+            if embeddings is None or len(embeddings) == 0:
+                fut.set_result(None)
+                return None
+            vector = np.asarray(embeddings[0], dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector = vector / norm
+            fut.set_result(vector)
+        except Exception as exc:
+            fut.set_exception(exc)
+            fut.exception() # mark retrieved so a lone failed caller doesn't warn
+            raise
+        finally:
+            del self._inflight_embeds[query]
+
+        self._query_vec_cache[query] = vector
+        if len(self._query_vec_cache) > self._query_vec_cache_max:
+            self._query_vec_cache.popitem(last=False) # evict LRU
+        return vector
 
-    def _find_semantic_cache_hit(self, query_vector: list[float], rerank: bool, size_needed: int) -> Optional[list[str]]:
+    async def _find_semantic_cache_hit(self, query_vector: np.ndarray, rerank: bool, size_needed: int) -> Optional[list[str]]:
         """
-        Simple helper to loop through semantic cache to find query hit via cos. sim. threshold.
+        Simple helper to check the semantic cache for a query hit via cos. sim. threshold.
         - rerank: must match the cached entry's reranked_bool to prevent cross-contamination
         - size_needed: len(cached_results) must be >= size_needed, or DB must have been exhausted
             - for retrieve_and_rerank: size_needed = retrieval_size
             - for retrieve_plain / retrieve: size_needed = limit
         - returns the cached results if hit, None otherwise
-        NOTE: since the max size of semantic cache is small (10), we find the best match after iterating through the entire list
+        Checks the shared Redis VSS cache first when enabled (one KNN round trip),
+        then the in-process SemanticCacheRing — whose pre-normalized contiguous
+        matrix makes the whole scan a single matrix-vector product.
         """
-        best_results = None
-        best_score = -1.0
-        for cached_vector, cached_results, cached_reranked, cached_fetch_rs in self._semantic_cache:
-            if cached_reranked != rerank:
-                continue
-            db_exhausted = cached_fetch_rs >= size_needed and len(cached_results) < cached_fetch_rs
-            if len(cached_results) < size_needed and not db_exhausted:
-                continue
-            score = self._cosine_similarity(query_vector, cached_vector)
-            if score >= self._cosine_similarity_threshold and score > best_score:
-                best_score = score
-                best_results = cached_results
-        return best_results
+        if self._redis_semantic_cache is not None:
+            hit = await self._redis_semantic_cache.find_best(
+                query_vector, rerank, size_needed, self._cosine_similarity_threshold
+            )
+            if hit is not None:
+                return hit
+        return self._semantic_cache.find_best(
+            query_vector, rerank, size_needed, self._cosine_similarity_threshold
+        )
+
+    def _append_semantic_cache(self, query_vector: np.ndarray, results: list[str], reranked: bool, fetch_rs: int) -> None:
+        """
+        Inserts into the in-process ring and, when enabled, mirrors the entry into
+        the shared Redis VSS cache as a fire-and-forget background task (same
+        rationale as the L2 population writes).
+        """
+        self._semantic_cache.append((query_vector, results, reranked, fetch_rs))
+        if self._redis_semantic_cache is not None:
+            task = asyncio.create_task(
+                self._redis_semantic_cache.append(query_vector, results, reranked, fetch_rs)
+            )
+            self._bg_tasks.add(task)
+            task.add_done_callback(self._on_bg_task_done)
 
     # main retrieval methods
     # two separate retrieval methods for rerank vs not
@@ -121,44 +542,44 @@ class MemoryInterface:
         """
         cache_key = self._make_cache_key(query, "plain")
 
-        # 1) L1 — upward compatible: serve if cached has enough results
-        if cache_key in self._exact_cache:
-            cached_results = self._exact_cache[cache_key]
-            if len(cached_results) >= limit:
-                logger.info(f"[L1 cache] exact hit: {query}")
-                self._exact_cache.move_to_end(cache_key)
-                return cached_results[:limit]
+        # 1) L1 — single C-level dict lookup; upward compatible: serve if cached has enough results
+        cached_results = self._exact_cache.get(cache_key)
+        if cached_results is not None and len(cached_results) >= limit:
+            logger.info("[L1 cache] exact hit: %s", query)
+            return cached_results[:limit]
 
         # 2) L2 Redis — upward compatible: serve if cached has enough results
         cached = await self.redis_client.get(cache_key)
         if cached:
-            results = json.loads(cached)
+            results = orjson.loads(cached)
             if len(results) >= limit:
-                logger.info(f"[L2 cache] Redis hit: {query}")
+                logger.info("[L2 cache] Redis hit: %s", query)
                 self._set_exact_cache(cache_key, results)
                 return results[:limit]
 
-        # otherwise, embed the query
-        embeddings = self.embedding_client.embed_text([query], task_type="RETRIEVAL_QUERY")
-        if not embeddings:
+        # otherwise, embed the query (memoized across requests)
+        query_vector = await self._get_query_vector(query)
+        if query_vector is None:
             return []
-        query_vector = embeddings[0]
 
         # 3) semantic cache — skip db retrieval if similar query was seen before
-        semantic_cache_result = self._find_semantic_cache_hit(query_vector, rerank=False, size_needed=limit)
+        semantic_cache_result = await self._find_semantic_cache_hit(query_vector, rerank=False, size_needed=limit)
         if semantic_cache_result:
-            logger.info(f"[L3 cache] semantic hit: {query}")
+            logger.info("[L3 cache] semantic hit: %s", query)
             self._set_exact_cache(cache_key, semantic_cache_result)
-            await self.redis_client.set(cache_key, json.dumps(semantic_cache_result))
+            self._set_redis_cache_bg(cache_key, orjson.dumps(semantic_cache_result))
             return semantic_cache_result[:limit]
 
         # 4) cache miss — retrieve from db and populate all caches
-        logger.info(f"no cache hit, retrieving from db: {query}")
-        results = await find_similar(query_vector=query_vector, engine=self.main_db_engine, limit=limit)
+        # fetch a widened row count: the HNSW scan cost is dominated by the fixed
+        # per-query work, and the bigger cached entry serves all smaller limits
+        logger.info("no cache hit, retrieving from db: %s", query)
+        fetch_limit = max(limit, self._min_fetch_limit)
+        results = await find_similar(query_vector=query_vector, engine=self.main_db_engine, limit=fetch_limit)
         self._set_exact_cache(cache_key, results)
-        self._semantic_cache.append((query_vector, results, False, limit))
-        await self.redis_client.set(cache_key, json.dumps(results))
-        return results
+        self._append_semantic_cache(query_vector, results, False, fetch_limit)
+        self._set_redis_cache_bg(cache_key, orjson.dumps(results))
+        return results[:limit]
 
     async def retrieve_and_rerank(self, query: str, limit: int = 5, retrieval_size: int = 50) -> list[str]:
         """
@@ -173,65 +594,77 @@ class MemoryInterface:
         original_fetch_rs = self._cache_fetch_sizes.get(cache_key, 0)
 
         # 1) L1 — if enough cached results (upward compatibility) OR DB was exhausted at the requested size
-        if cache_key in self._exact_cache:
-            cached_results = self._exact_cache[cache_key]
+        cached_results = self._exact_cache.get(cache_key)
+        if cached_results is not None:
             db_exhausted = original_fetch_rs >= retrieval_size and len(cached_results) < original_fetch_rs
             if len(cached_results) >= retrieval_size or db_exhausted:
-                logger.info(f"[L1 cache] exact hit: {query}")
-                self._exact_cache.move_to_end(cache_key)
+                logger.info("[L1 cache] exact hit: %s", query)
                 return cached_results[:limit]
 
         # 2) L2 Redis — if enough cached results (upward compatibility) OR DB was exhausted at the requested size
         async with async_timer("redis_get"):
             cached = await self.redis_client.get(cache_key)
         if cached:
-            data = json.loads(cached)
+            data = orjson.loads(cached)
             # parses the data from redis
             results, redis_fetch_rs = data["results"], data["fetch_rs"]
             db_exhausted = redis_fetch_rs >= retrieval_size and len(results) < redis_fetch_rs
             if len(results) >= retrieval_size or db_exhausted:
-                logger.info(f"[L2 cache] Redis hit: {query}")
+                logger.info("[L2 cache] Redis hit: %s", query)
                 self._set_exact_cache(cache_key, results, fetch_rs=redis_fetch_rs)
                 return results[:limit]
 
-        # otherwise, embed the query
+        # otherwise, embed the query (memoized across requests)
         async with async_timer("embed_text"):
-            embeddings = self.embedding_client.embed_text([query], task_type="RETRIEVAL_QUERY")
-        if not embeddings:
+            query_vector = await self._get_query_vector(query)
+        if query_vector is None:
             return []
-        query_vector = embeddings[0]
 
         # 3) semantic cache — valid if reranked entry with enough candidates; re-rank on exact query
-        semantic_cache_result = self._find_semantic_cache_hit(query_vector, rerank=True, size_needed=retrieval_size)
+        semantic_cache_result = await self._find_semantic_cache_hit(query_vector, rerank=True, size_needed=retrieval_size)
         if semantic_cache_result:
-            logger.info(f"[L3 cache] semantic hit: {query}")
+            logger.info("[L3 cache] semantic hit: %s", query)
             async with async_timer("rerank"):
                 reranked = self._rerank(query, semantic_cache_result)
             self._set_exact_cache(cache_key, reranked, fetch_rs=retrieval_size)
-            await self.redis_client.set(cache_key, json.dumps({"results": reranked, "fetch_rs": retrieval_size}))
+            self._set_redis_cache_bg(cache_key, orjson.dumps({"results": reranked, "fetch_rs": retrieval_size}))
             return reranked[:limit]
 
         # 4) cache miss — retrieve from db, rerank, populate all caches
-        logger.info(f"no cache hit, retrieving from db: {query}")
+        logger.info("no cache hit, retrieving from db: %s", query)
         async with async_timer("find_similar"):
             results = await find_similar(query_vector=query_vector, engine=self.main_db_engine, limit=retrieval_size)
         async with async_timer("rerank"):
             reranked = self._rerank(query, results)
         # NOTE: stores all reranked results to caches.
         self._set_exact_cache(cache_key, reranked, fetch_rs=retrieval_size)
-        self._semantic_cache.append((query_vector, reranked, True, retrieval_size))
-        await self.redis_client.set(cache_key, json.dumps({"results": reranked, "fetch_rs": retrieval_size}))
+        self._append_semantic_cache(query_vector, reranked, True, retrieval_size)
+        self._set_redis_cache_bg(cache_key, orjson.dumps({"results": reranked, "fetch_rs": retrieval_size}))
         # returns just the top-k requested
         return reranked[:limit]
 
     # helper methods for reranking
-    def _rerank(self, query, docs) -> list[str]:
+    def _rerank(self, query, docs, k: Optional[int] = None) -> list[str]:
         """
         Thin wrapper around cross-encoder reranker.
         - Takes a query and list of docs and returns reranked list results (list[str]).
+        - k selects only the top-k scored pairs (argpartition inside the
+          reranker, O(n + k log k)). The cache-populating callers in
+          retrieve_and_rerank deliberately pass k=None: cached entries must hold
+          the complete ordering so they can serve larger limits later.
+        - only the top _rerank_top_m ANN candidates go through the cross-encoder
+          (forward cost is linear in batch size); the tail keeps its ANN order
+          and is appended after. Embedding similarity is already a strong
+          ranking, so the cross-encoder only matters among the head candidates.
+          Candidate sets of <= 2 skip the model pass entirely.
         """
-        pairs = [(query, doc) for doc in docs]
-        reranked_results = self.cross_encoder_reranker.rerank(pairs)
-        # parse just the docs from reranked results and return
-        return [doc for _, doc in reranked_results]
+        if len(docs) <= 2:
+            return list(docs)
+        head = docs[:self._rerank_top_m]
+        tail = docs[self._rerank_top_m:]
+        # numpy-native path: rank() returns score/order arrays and we index the
+        # docs directly, skipping the (score, doc) tuple materialization
+        _, order = self.cross_encoder_reranker.rank(query, head, k=k)
+        results = [head[i] for i in order] + tail
+        return results[:k] if k is not None else results
     
\ No newline at end of file
@@ -2,7 +2,7 @@
 # Inherits all existing caching/retrieval behaviour from MemoryInterface and overrides
 # retrieve / retrieve_and_rerank to incorporate warm-buffer freshness when active.
 import asyncio
-import json
+import orjson
 import numpy as np
 from sqlalchemy.ext.asyncio import AsyncEngine
 import redis.asyncio as aioredis
@@ -10,6 +10,7 @@ from typing import Optional, cast
 
 from memory_interface import MemoryInterface
 from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
+from models.embeddings.batched_embedder import BatchedEmbedder
 from models.reranker.cross_encoder import CEReranker
 from db.crud import (
     find_similar,
@@ -20,6 +21,7 @@ from db.crud import (
 )
 from common.logger import logger
 from common.timer import async_timer
+from common.topk import topk
 
 
 class ExtendedMemoryInterface(MemoryInterface):
@@ -71,6 +73,8 @@ class ExtendedMemoryInterface(MemoryInterface):
         main_db_engine: AsyncEngine,
         redis_client: aioredis.Redis,
         cross_encoder_reranker: CEReranker,
+        batched_embedder: Optional[BatchedEmbedder] = None,
+        use_redis_semantic_cache: bool = False,
         warm_buffer_flush_threshold: int = 100,
     ):
         super().__init__(
@@ -78,6 +82,8 @@ class ExtendedMemoryInterface(MemoryInterface):
             main_db_engine=main_db_engine,
             redis_client=redis_client,
             cross_encoder_reranker=cross_encoder_reranker,
+            batched_embedder=batched_embedder,
+            use_redis_semantic_cache=use_redis_semantic_cache,
         )
         # warm buffer: [{ground_truth_id, vector, text}]
         self._warm_buffer: list[dict] = []
@@ -92,22 +98,28 @@ class ExtendedMemoryInterface(MemoryInterface):
         Brute-force cosine-similarity search over the warm buffer.
         Returns up to 'limit' entries sorted by descending similarity, each tagged
         with source='warm_buffer' for downstream validation.
+        NOTE: similarities are computed as one batched matrix product and the
+        selection uses the bounded top-k kernel instead of a full sort.
         """
         if not self._warm_buffer:
             return []
-        scored = [
-            (self._cosine_similarity(query_vector, entry["vector"]), entry)
-            for entry in self._warm_buffer
-        ]
-        scored.sort(key=lambda x: x[0], reverse=True)
+        # buffer vectors are unit-normalized at insertion (store_via_warm_buffer),
+        # so cosine reduces to a plain dot product: normalize the query once and
+        # skip the per-row norm computation + division entirely
+        matrix = np.asarray([entry["vector"] for entry in self._warm_buffer], dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0.0:
+            return [] # guard zero vectors (possible with test inputs)
+        scores = matrix @ (query / query_norm)
         return [
             {
                 "id": None,
-                "text": entry["text"],
-                "ground_truth_id": entry["ground_truth_id"],
+                "text": self._warm_buffer[i]["text"],
+                "ground_truth_id": self._warm_buffer[i]["ground_truth_id"],
                 "source": "warm_buffer",
             }
-            for _, entry in scored[:limit]
+            for i in topk(scores, limit)
         ]
 
     async def _validate_candidates(self, candidates: list[dict]) -> list[str]:
@@ -230,15 +242,25 @@ class ExtendedMemoryInterface(MemoryInterface):
 
         # 2. Embed and hold in warm buffer
         embeddings = await self.embedding_client.aembed_text([text], task_type="RETRIEVAL_DOCUMENT")
-        if not embeddings:
+        if embeddings is None or len(embeddings) == 0:
             logger.error(
                 f"[warm buffer] embedding failed; ground_truth_id={gt_id} remains in GT only"
             )
             return gt_id
 
+        # normalize once at insertion: the buffer is searched far more often than it
+        # is written, and unit-norm rows turn every cosine search into a dot product.
+        # cosine distance is scale-invariant, so flushing the normalized vector to
+        # the vector DB retrieves identically.
+        vector = embeddings[0] # float32 ndarray row straight from the client
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        # stored as-is: pgvector binds ndarrays directly on flush, and the buffer
+        # search stacks the rows without a list round trip
         self._warm_buffer.append({
             "ground_truth_id": gt_id,
-            "vector": embeddings[0],
+            "vector": vector,
             "text": text,
         })
         logger.info(f"[warm buffer] entry added; buffer_size={len(self._warm_buffer)}")
@@ -290,59 +312,57 @@ class ExtendedMemoryInterface(MemoryInterface):
         cache_key = self._make_cache_key(query, "plain")
 
         if not self._warm_buffer:
-            # L1
-            if cache_key in self._exact_cache:
-                cached_results = self._exact_cache[cache_key]
-                if len(cached_results) >= limit:
-                    logger.info(f"[L1 cache] exact hit: {query}")
-                    self._exact_cache.move_to_end(cache_key)
-                    return cached_results[:limit]
+            # L1 — single C-level dict lookup
+            cached_results = self._exact_cache.get(cache_key)
+            if cached_results is not None and len(cached_results) >= limit:
+                logger.info("[L1 cache] exact hit: %s", query)
+                return cached_results[:limit]
 
             # L2 Redis
             cached = await self.redis_client.get(cache_key)
             if cached:
-                results = json.loads(cached)
+                results = orjson.loads(cached)
                 if len(results) >= limit:
-                    logger.info(f"[L2 cache] Redis hit: {query}")
+                    logger.info("[L2 cache] Redis hit: %s", query)
                     self._set_exact_cache(cache_key, results)
                     return results[:limit]
 
-            embeddings = self.embedding_client.embed_text([query], task_type="RETRIEVAL_QUERY")
-            if not embeddings:
+            query_vector = await self._get_query_vector(query)
+            if query_vector is None:
                 return []
-            query_vector = embeddings[0]
 
             # L3 semantic cache
-            semantic_hit = self._find_semantic_cache_hit(query_vector, rerank=False, size_needed=limit)
+            semantic_hit = await self._find_semantic_cache_hit(query_vector, rerank=False, size_needed=limit)
             if semantic_hit:
-                logger.info(f"[L3 cache] semantic hit: {query}")
+                logger.info("[L3 cache] semantic hit: %s", query)
                 self._set_exact_cache(cache_key, semantic_hit)
-                await self.redis_client.set(cache_key, json.dumps(semantic_hit))
+                self._set_redis_cache_bg(cache_key, orjson.dumps(semantic_hit))
                 return semantic_hit[:limit]
 
-            # DB miss — query VectorDBManaged
-            logger.info(f"no cache hit, retrieving from managed db: {query}")
+            # DB miss — query VectorDBManaged with a widened row count so the
+            # cached entry serves all future limits up to _min_fetch_limit
+            logger.info("no cache hit, retrieving from managed db: %s", query)
+            fetch_limit = max(limit, self._min_fetch_limit)
             async with async_timer("find_similar_extended"):
-                db_rows = await find_similar_extended(query_vector, self.main_db_engine, limit)
+                db_rows = await find_similar_extended(query_vector, self.main_db_engine, fetch_limit)
             results = [row["text"] for row in db_rows]
             self._set_exact_cache(cache_key, results)
-            self._semantic_cache.append((query_vector, results, False, limit))
-            await self.redis_client.set(cache_key, json.dumps(results))
-            return results
+            self._append_semantic_cache(query_vector, results, False, fetch_limit)
+            self._set_redis_cache_bg(cache_key, orjson.dumps(results))
+            return results[:limit]
 
         # warm buffer active — bypass caches
-        logger.info(f"[warm buffer active] retrieve bypassing caches: '{query}'")
-        embeddings = self.embedding_client.embed_text([query], task_type="RETRIEVAL_QUERY")
-        if not embeddings:
+        logger.info("[warm buffer active] retrieve bypassing caches: '%s'", query)
+        query_vector = await self._get_query_vector(query)
+        if query_vector is None:
             return []
-        query_vector = embeddings[0]
 
         results = await self._fetch_fresh_validated(query_vector, limit)
 
         # Populate caches so they're warm once the buffer is flushed
         self._set_exact_cache(cache_key, results)
-        self._semantic_cache.append((query_vector, results, False, limit))
-        await self.redis_client.set(cache_key, json.dumps(results))
+        self._append_semantic_cache(query_vector, results, False, limit)
+        self._set_redis_cache_bg(cache_key, orjson.dumps(results))
         return results
 
     async def retrieve_and_rerank(self, query: str, limit: int = 5, retrieval_size: int = 50) -> list[str]:
@@ -363,62 +383,59 @@ class ExtendedMemoryInterface(MemoryInterface):
         if not self._warm_buffer:
             original_fetch_rs = self._cache_fetch_sizes.get(cache_key, 0)
 
-            # L1
-            if cache_key in self._exact_cache:
-                cached_results = self._exact_cache[cache_key]
+            # L1 — single C-level dict lookup
+            cached_results = self._exact_cache.get(cache_key)
+            if cached_results is not None:
                 db_exhausted = original_fetch_rs >= retrieval_size and len(cached_results) < original_fetch_rs
                 if len(cached_results) >= retrieval_size or db_exhausted:
-                    logger.info(f"[L1 cache] exact hit: {query}")
-                    self._exact_cache.move_to_end(cache_key)
+                    logger.info("[L1 cache] exact hit: %s", query)
                     return cached_results[:limit]
 
             # L2 Redis
             async with async_timer("redis_get"):
                 cached = await self.redis_client.get(cache_key)
             if cached:
-                data = json.loads(cached)
+                data = orjson.loads(cached)
                 results, redis_fetch_rs = data["results"], data["fetch_rs"]
                 db_exhausted = redis_fetch_rs >= retrieval_size and len(results) < redis_fetch_rs
                 if len(results) >= retrieval_size or db_exhausted:
-                    logger.info(f"[L2 cache] Redis hit: {query}")
+                    logger.info("[L2 cache] Redis hit: %s", query)
                     self._set_exact_cache(cache_key, results, fetch_rs=redis_fetch_rs)
                     return results[:limit]
 
             async with async_timer("embed_text"):
-                embeddings = self.embedding_client.embed_text([query], task_type="RETRIEVAL_QUERY")
-            if not embeddings:
+                query_vector = await self._get_query_vector(query)
+            if query_vector is None:
                 return []
-            query_vector = embeddings[0]
 
             # L3 semantic cache
-            semantic_hit = self._find_semantic_cache_hit(query_vector, rerank=True, size_needed=retrieval_size)
+            semantic_hit = await self._find_semantic_cache_hit(query_vector, rerank=True, size_needed=retrieval_size)
             if semantic_hit:
-                logger.info(f"[L3 cache] semantic hit: {query}")
+                logger.info("[L3 cache] semantic hit: %s", query)
                 async with async_timer("rerank"):
                     reranked = self._rerank(query, semantic_hit)
                 self._set_exact_cache(cache_key, reranked, fetch_rs=retrieval_size)
-                await self.redis_client.set(cache_key, json.dumps({"results": reranked, "fetch_rs": retrieval_size}))
+                self._set_redis_cache_bg(cache_key, orjson.dumps({"results": reranked, "fetch_rs": retrieval_size}))
                 return reranked[:limit]
 
             # DB miss — query VectorDBManaged
-            logger.info(f"no cache hit, retrieving from managed db: {query}")
+            logger.info("no cache hit, retrieving from managed db: %s", query)
             async with async_timer("find_similar_extended"):
                 db_rows = await find_similar_extended(query_vector, self.main_db_engine, retrieval_size)
             results = [row["text"] for row in db_rows]
             async with async_timer("rerank"):
                 reranked = self._rerank(query, results)
             self._set_exact_cache(cache_key, reranked, fetch_rs=retrieval_size)
-            self._semantic_cache.append((query_vector, reranked, True, retrieval_size))
-            await self.redis_client.set(cache_key, json.dumps({"results": reranked, "fetch_rs": retrieval_size}))
+            self._append_semantic_cache(query_vector, reranked, True, retrieval_size)
+            self._set_redis_cache_bg(cache_key, orjson.dumps({"results": reranked, "fetch_rs": retrieval_size}))
             return reranked[:limit]
 
         # warm buffer active — bypass caches
-        logger.info(f"[warm buffer active] retrieve_and_rerank bypassing caches: '{query}'")
+        logger.info("[warm buffer active] retrieve_and_rerank bypassing caches: '%s'", query)
         async with async_timer("embed_text"):
-            embeddings = self.embedding_client.embed_text([query], task_type="RETRIEVAL_QUERY")
-        if not embeddings:
+            query_vector = await self._get_query_vector(query)
+        if query_vector is None:
             return []
-        query_vector = embeddings[0]
 
         candidates = await self._fetch_fresh_validated(query_vector, retrieval_size)
         async with async_timer("rerank"):
@@ -426,8 +443,8 @@ class ExtendedMemoryInterface(MemoryInterface):
 
         # Populate caches
         self._set_exact_cache(cache_key, reranked, fetch_rs=retrieval_size)
-        self._semantic_cache.append((query_vector, reranked, True, retrieval_size))
-        await self.redis_client.set(cache_key, json.dumps({"results": reranked, "fetch_rs": retrieval_size}))
+        self._append_semantic_cache(query_vector, reranked, True, retrieval_size)
+        self._set_redis_cache_bg(cache_key, orjson.dumps({"results": reranked, "fetch_rs": retrieval_size}))
         return reranked[:limit]
 
     # ── periodic flush lifecycle ────────────────────────────────────────────────
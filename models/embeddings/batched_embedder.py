@@ -0,0 +1,129 @@
+# dynamic batching layer over the Gemini embedding client
+# coalesces concurrent single-text embed requests into one batched API call
+import asyncio
+import numpy as np
+from typing import Optional
+
+from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
+from common.logger import logger
+
+class BatchedEmbedder:
+    """
+    Coalesces concurrent embedding requests into batched Gemini calls.
+
+    Each caller awaits embed(text, task_type); a background worker drains the
+    queue, gathering up to max_batch items or waiting max_wait_ms after the
+    first item, then issues a single aembed_text call per task_type and
+    resolves every caller's future with its own vector.
+
+    Mechanism: the per-call overhead (TLS/HTTP/serialization RTT) is amortized
+    across all texts in the window, so N concurrent requests cost ~1 API call.
+    """
+
+    def __init__(
+        self,
+        embedding_client: GenAITextEmbeddingClient,
+        max_batch: int = 32,
+        max_wait_ms: float = 8.0,
+    ):
+        self.embedding_client = embedding_client
+        self._max_batch = max_batch
+        self._max_wait_s = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue[tuple[str, str, asyncio.Future]] = asyncio.Queue()
+        self._worker_task: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str, task_type: str = "RETRIEVAL_DOCUMENT") -> Optional[np.ndarray]:
+        """
+        Queues a single text for embedding and awaits its vector.
+        Returns None if the underlying embedding call failed (mirrors aembed_text).
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, task_type, future))
+        return await future
+
+    async def _run_worker(self) -> None:
+        """
+        Internal worker loop: block on the first queued item, then collect more
+        until max_batch is reached or max_wait elapses, and flush as one call.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_s
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # a bug in flushing one batch must not kill the worker: unresolved
+            # futures would make every subsequent embed() await forever
+            try:
+                await self._flush_batch(batch)
+            except Exception as exc:
+                logger.error(f"[batched embedder] flush failed for batch of {len(batch)}: {exc}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    async def _flush_batch(self, batch: list[tuple[str, str, asyncio.Future]]) -> None:
+        """
+        Issues one aembed_text call per task_type in the batch and resolves futures.
+        Failures are propagated to the affected callers only; the worker keeps running.
+        """
+        by_task_type: dict[str, list[tuple[str, asyncio.Future]]] = {}
+        for text, task_type, future in batch:
+            by_task_type.setdefault(task_type, []).append((text, future))
+
+        for task_type, items in by_task_type.items():
+            texts = [text for text, _ in items]
+            try:
+                embeddings = await self.embedding_client.aembed_text(texts, task_type=task_type)
+            except Exception as exc:
+                logger.error(f"[batched embedder] embed call failed for batch of {len(items)}: {exc}")
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            # embeddings is an (n, dim) ndarray; explicit None/length checks (ndarray truthiness raises)
+            if embeddings is None or len(embeddings) != len(items):
+                logger.error(
+                    f"[batched embedder] expected {len(items)} embeddings, got "
+                    f"{len(embeddings) if embeddings is not None else 0}"
+                )
+                for _, future in items:
+                    if not future.done():
+                        future.set_result(None)
+                continue
+
+            for (_, future), vector in zip(items, embeddings):
+                if not future.done():
+                    future.set_result(vector)
+
+    def start(self) -> None:
+        """
+        Starts the background batching worker.
+        Safe to call multiple times; does nothing if the worker is already running.
+        Intended to be called from lifespan on service startup.
+        """
+        if self._worker_task and not self._worker_task.done():
+            logger.warning("[batched embedder] worker already running; ignoring start request")
+            return
+        self._worker_task = asyncio.create_task(self._run_worker())
+        logger.info(f"[batched embedder] started (max_batch={self._max_batch}, max_wait={self._max_wait_s * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        """
+        Cancels and awaits the background worker.
+        Intended to be called from lifespan on service shutdown.
+        """
+        if self._worker_task and not self._worker_task.done():
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+        logger.info("[batched embedder] stopped")
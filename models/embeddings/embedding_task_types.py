@@ -1,16 +1,24 @@
 # task types for task-specific embedding generation
 
-from enum import Enum
+from enum import StrEnum
 
 # valid task types for text embedding models
 # check for more: https://ai.google.dev/gemini-api/docs/embeddings#task-types
 
-VALID_GEMINI_TASK_TYPES = frozenset({
-    "RETRIEVAL_QUERY",
-    "RETRIEVAL_DOCUMENT",
-    "SEMANTIC_SIMILARITY",
-    "CLASSIFICATION",
-    "CLUSTERING",
-    "QUESTION_ANSWERING",
-    "FACT_VERIFICATION",
-})
+class GeminiTaskType(StrEnum):
+    """
+    Valid Gemini embedding task types. StrEnum members compare and serialize as
+    plain strings, so call sites can keep passing literals while construction
+    (GeminiTaskType(value)) validates once — the hot embed path no longer pays a
+    per-call membership check.
+    """
+    RETRIEVAL_QUERY = "RETRIEVAL_QUERY"
+    RETRIEVAL_DOCUMENT = "RETRIEVAL_DOCUMENT"
+    SEMANTIC_SIMILARITY = "SEMANTIC_SIMILARITY"
+    CLASSIFICATION = "CLASSIFICATION"
+    CLUSTERING = "CLUSTERING"
+    QUESTION_ANSWERING = "QUESTION_ANSWERING"
+    FACT_VERIFICATION = "FACT_VERIFICATION"
+
+# kept for any external callers still importing the frozenset form
+VALID_GEMINI_TASK_TYPES = frozenset(GeminiTaskType)
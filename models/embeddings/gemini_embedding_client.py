@@ -1,5 +1,6 @@
 # gemini text embedding client
 
+import numpy as np
 from google import genai
 from google.genai import types
 from google.genai.types import ContentEmbedding
@@ -10,7 +11,7 @@ from dotenv import load_dotenv
 from typing import Type, List, Optional
 
 # task types
-from models.embeddings.embedding_task_types import VALID_GEMINI_TASK_TYPES
+from models.embeddings.embedding_task_types import GeminiTaskType
 
 # TODO: if using proper, async embedding calls in the future, use tenacity for retries
 
@@ -22,22 +23,44 @@ class GenAITextEmbeddingClient():
         self,
         model_name: str = "gemini-embedding-001", # google genai's default text embedding model
         content_type: str = "RETRIEVAL_DOCUMENT", # choose to differ embedding style based on desired tasks
-        embedding_size: int = 1536, # NOTE: use at max 1536 embeddings for now, since pgvector supports upto 2000 dims. Default is 3072, could be explored later.
+        embedding_size: int = 1536, # NOTE: use at max 1536 embeddings for now, since pgvector supports upto 2000 dims. Gemini's max is 3072; configurable via EMBEDDING_DIM in the service settings.
         *,
         api_key: str | None = None,
     ):
         self.client = genai.Client(api_key=api_key)
         self.model_name = model_name
-        self.default_task_type = content_type # content/task type to specialized embeddings
+        # validate once at construction; the embed paths then skip per-call membership checks
+        self.default_task_type = GeminiTaskType(content_type)
         self.embedding_size = embedding_size
 
-    def embed_text(self, contents: list[str], task_type: Optional[str] = None) -> Optional[list[list[float]]]:
+    def _extract_vectors(self, embeddings: List[ContentEmbedding]) -> np.ndarray:
+        """
+        Stacks the response vectors into one (n, dim) float32 ndarray — callers
+        index rows instead of traversing Python lists of boxed floats, and the
+        rows feed pgvector and the caches without further conversion.
+        Re-normalizes when needed: Gemini only guarantees unit-norm output at the
+        full 3072 dims — truncated (Matryoshka) sizes come back un-normalized,
+        which would skew every cosine/dot-product comparison downstream.
+        """
+        rows = [e.values for e in embeddings if e.values is not None]
+        # preallocate the destination once and fill row by row: np.asarray on a
+        # list of lists walks every boxed float twice (shape inference + copy),
+        # while filling a preallocated buffer converts each row exactly once
+        arr = np.empty((len(rows), self.embedding_size), dtype=np.float32)
+        for i, row in enumerate(rows):
+            arr[i] = row
+        if arr.size and self.embedding_size < 3072:
+            norms = np.linalg.norm(arr, axis=1, keepdims=True)
+            norms[norms == 0.0] = 1.0
+            arr = arr / norms
+        return arr
+
+    def embed_text(self, contents: list[str], task_type: Optional[GeminiTaskType | str] = None) -> Optional[np.ndarray]:
         """
         Simple helper to embed a list of text strings using gemini client.
         - Uses custom task_type for embedding style if provided, otherwise default is used
         """
-        # ensures that task type is valid
-        resolved_task_type = task_type if task_type in VALID_GEMINI_TASK_TYPES else self.default_task_type
+        resolved_task_type = task_type if task_type is not None else self.default_task_type
 
         result = self.client.models.embed_content(
             model=self.model_name,
@@ -48,19 +71,19 @@ class GenAITextEmbeddingClient():
 
         if result and result.embeddings:
             print(f"Embedding successful!")
-            return [e.values for e in result.embeddings if e.values is not None]
+            return self._extract_vectors(result.embeddings)
         
         # otherwise, log error
         print(f"Embedding failed, result {result}, embeddings {result.embeddings}")
         return None
 
-    async def aembed_text(self, contents: list[str], task_type: Optional[str] = None) -> Optional[list[list[float]]]:
+    async def aembed_text(self, contents: list[str], task_type: Optional[GeminiTaskType | str] = None) -> Optional[np.ndarray]:
         """
         Async version of the embed_text() method.
         - Converts a list of text strings into a list of embedding vectors w/ custom task type.
         - uses client.aio.models instead of client.models
         """
-        resolved_task_type = task_type if task_type in VALID_GEMINI_TASK_TYPES else self.default_task_type
+        resolved_task_type = task_type if task_type is not None else self.default_task_type
 
         # uses async model
         result = await self.client.aio.models.embed_content(
@@ -72,7 +95,7 @@ class GenAITextEmbeddingClient():
             
         if result and result.embeddings:
             print(f"Embedding successful!")
-            return [e.values for e in result.embeddings if e.values is not None]
+            return self._extract_vectors(result.embeddings)
         
         # otherwise, log error
         print(f"Embedding failed, result {result}, embeddings {result.embeddings}")
@@ -1,6 +1,6 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-import time
+import sys
 
 # import all tables here
 from db.model import MainDB_Base
@@ -11,18 +11,30 @@ from db.model import GroundTruth
 from dotenv import load_dotenv
 import os
 
+def confirm_or_skip(warning: str) -> None:
+    """
+    Interactive guard for table DDL. With a TTY the user must type YES;
+    non-interactive callers (CI, reset_tables.py) have no TTY or set
+    SKIP_CONFIRM=1 and skip the prompt entirely — the old unconditional
+    sleeps added fixed wall-clock seconds to every scripted reset.
+    """
+    if not sys.stdin.isatty() or os.getenv("SKIP_CONFIRM"):
+        return
+    print(warning)
+    if input("Type YES to proceed: ").strip() != "YES":
+        print("Aborted.")
+        exit(1)
+
 def create_all_tables(engine):
     # warn users if they don't want to commit this action
-    print(
-        f"""
-        CREATING ALL TABLES FOR MAIN DB IN 3 SEC...
-        PLEASE ABORT NOW IF YOU'D LIKE TO STOP!!!
-        """
-    )
-    time.sleep(3)
+    confirm_or_skip("CREATING ALL TABLES FOR MAIN DB, PLEASE DOUBLE CHECK!!")
 
     with engine.connect() as conn:
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
+        # upgrade an already-installed extension to the newest version the server
+        # ships: newer pgvector releases carry faster SIMD distance kernels (and
+        # halfvec support), and CREATE ... IF NOT EXISTS alone never upgrades
+        conn.execute(text("ALTER EXTENSION vector UPDATE;"))
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
         conn.commit()
 
@@ -30,9 +42,8 @@ def create_all_tables(engine):
     print("Tables created successfully!")
 
 def create_table(table_name, engine):
-    print(f"WARNING: THIS WILL CREATE TABLE *{table_name}* IN THE MAIN DB (IF IT DOESN'T EXIST ALREADY) IN 3 SECONDS, PLEASE DOUBLE CHECK!!")
-    time.sleep(3)
-    
+    confirm_or_skip(f"WARNING: THIS WILL CREATE TABLE *{table_name}* IN THE MAIN DB (IF IT DOESN'T EXIST ALREADY), PLEASE DOUBLE CHECK!!")
+
     try:
         table = MainDB_Base.metadata.tables[table_name]
     except KeyError:
@@ -1,6 +1,5 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-import time
 # import all tables here
 from db.model import MainDB_Base
 from db.model import VectorDB
@@ -10,11 +9,13 @@ from db.model import GroundTruth
 from dotenv import load_dotenv
 import os
 
+# shared interactive guard (TTY prompt, skipped in CI / with SKIP_CONFIRM=1)
+from scripts.create_tables import confirm_or_skip
+
 # helper to delete all tables
 def delete_all_tables(engine):
     print(list(MainDB_Base.metadata.tables.keys()))
-    print(f"WARNING: THIS WILL DELETE **ALL** TABLES IN THE MAIN DB IN 5 SECONDS, PLEASE DOUBLE CHECK!!")
-    time.sleep(5)
+    confirm_or_skip(f"WARNING: THIS WILL DELETE **ALL** TABLES IN THE MAIN DB, PLEASE DOUBLE CHECK!!")
     print(f"Dropping all tables now...")
 
     # Set statement timeout to prevent hanging
@@ -27,23 +28,25 @@ def delete_all_tables(engine):
     except Exception as e:
         print(f"Error: {e}")
         print("Trying alternative method...")
-        
-        # Fallback: drop each table individually with CASCADE
-        for table_name in reversed(list(MainDB_Base.metadata.tables.keys())):
-            try:
-                with engine.connect() as conn:
-                    conn.execute(text(f"DROP TABLE IF EXISTS {table_name} CASCADE;"))
-                    conn.commit()
-                print(f"SUCCESS: Dropped {table_name}")
-            except Exception as e2:
-                print(f"WARNING: Error dropping {table_name}: {e2}")
+
+        # Fallback: one DROP TABLE ... CASCADE for all tables on one connection.
+        # The old per-table loop opened a fresh connection (TLS handshake) and
+        # committed a separate DDL transaction for every table; a single
+        # statement does one round trip and CASCADE handles the FK ordering.
+        table_names = ", ".join(reversed(list(MainDB_Base.metadata.tables.keys())))
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("SET statement_timeout = '30s';"))
+                conn.execute(text(f"DROP TABLE IF EXISTS {table_names} CASCADE;"))
+            print(f"SUCCESS: Dropped {table_names}")
+        except Exception as e2:
+            print(f"WARNING: Error dropping tables: {e2}")
     print("Tables deleted successfully!")
 
 # helper to delete a single table
 def delete_table(table_name, engine):
-    print(f"WARNING: THIS WILL DELETE TABLE *{table_name}* IN THE MAIN DB IN 5 SECONDS, PLEASE DOUBLE CHECK!!")
-    time.sleep(5)
-    
+    confirm_or_skip(f"WARNING: THIS WILL DELETE TABLE *{table_name}* IN THE MAIN DB, PLEASE DOUBLE CHECK!!")
+
     try:
         print(f"Dropping table {table_name} now...")
         table = MainDB_Base.metadata.tables[table_name]
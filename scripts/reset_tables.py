@@ -11,7 +11,7 @@ from dotenv import load_dotenv
 import os
 
 # import creation and deletion scripts
-from scripts.create_tables import create_all_tables
+from scripts.create_tables import create_all_tables, confirm_or_skip
 from scripts.delete_tables import delete_all_tables
 
 # NOTE: trouble shooting: if script imports do not work, use PYTHONPATH=. to explicitly include root of project
@@ -37,6 +37,9 @@ if __name__ == "__main__":
         exit(1)
 
     # NOTE: this is the actual logic to reset: edit as needed
+    # confirm once for the whole reset; the sub-steps then skip their own prompts
+    confirm_or_skip("WARNING: THIS WILL RESET (DELETE THEN RECREATE) **ALL** TABLES IN THE MAIN DB, PLEASE DOUBLE CHECK!!")
+    os.environ["SKIP_CONFIRM"] = "1"
     delete_all_tables(engine)
     create_all_tables(engine)
     print(f"All tables reset successfully!")
@@ -1,47 +1,51 @@
-# test to embed a sample text and store it in vector db via ORM mapping
-from dotenv import load_dotenv
-from pathlib import Path
+# test to embed sample texts and store them in vector db via ORM mapping
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert
 
+from db.bulk import copy_vectors
+from db.engine import Session # shared pooled engine; avoids a TLS handshake per run
 from db.model import VectorDB
 from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
 
-# load env + construct db connection url
-load_dotenv(Path(__file__).resolve().parents[1] / ".env")
-
-MAIN_DB_USER = os.getenv("MAIN_DB_USER")
-MAIN_DB_PW = os.getenv("MAIN_DB_PW")
-MAIN_DB_HOST = os.getenv("MAIN_DB_HOST")
-MAIN_DB_PORT = os.getenv("MAIN_DB_PORT")
-MAIN_DB_NAME = os.getenv("MAIN_DB_NAME")
-
-MAIN_DB_URL = f"postgresql+psycopg2://{MAIN_DB_USER}:{MAIN_DB_PW}@{MAIN_DB_HOST}:{MAIN_DB_PORT}/{MAIN_DB_NAME}?sslmode=require"
+# batches at or above this size go through binary COPY instead of executemany;
+# below it the COPY framing overhead isn't worth it
+BULK_COPY_MIN_ROWS = 32
 
 if __name__ == "__main__":
 
-    # test input
-    sample_text = "The quick brown fox jumps over the lazy dog."
+    # test inputs: one batched embed API call, one multi-row INSERT — the old
+    # one-text-one-row flow paid a full API + DB round trip per item when used
+    # as a seed script
+    sample_texts = [
+        "The quick brown fox jumps over the lazy dog.",
+        "A fast auburn fox vaults over a sleepy hound.",
+        "The lazy dog naps while the fox runs past.",
+    ]
 
-    engine = create_engine(MAIN_DB_URL)
     embedding_client = GenAITextEmbeddingClient(api_key=os.getenv("GEMINI_API_KEY"))
 
-    print(f"Embedding: {sample_text}")
-    embeddings = embedding_client.embed_text([sample_text])
+    print(f"Embedding {len(sample_texts)} texts")
+    embeddings = embedding_client.embed_text(sample_texts)
 
-    if not embeddings:
+    if embeddings is None or len(embeddings) != len(sample_texts):
         print("Embedding failed, no result returned.")
         exit(1)
 
-    vector = embeddings[0]
-    print(f"Embedded vector length: {len(vector)}")
-
-    obj = VectorDB(vector=vector, text=sample_text)
-    with sessionmaker(engine)() as session:
-        session.add(obj)
+    print(f"Embedded matrix shape: {embeddings.shape}")
+
+    with Session() as session:
+        if len(sample_texts) >= BULK_COPY_MIN_ROWS:
+            # seed-scale batches: binary COPY is bounded by network throughput,
+            # not per-row latency
+            copy_vectors(session, sample_texts, embeddings)
+        else:
+            # executemany over the insert construct: the psycopg2 dialect folds
+            # the parameter sets into multi-row VALUES instead of N single INSERTs
+            session.execute(
+                insert(VectorDB),
+                [{"vector": vector, "text": text} for vector, text in zip(embeddings, sample_texts)],
+            )
         session.commit()
-        session.refresh(obj)
 
-    print(f"Stored row {obj.id} successfully.")
+    print(f"Stored {len(sample_texts)} rows successfully.")
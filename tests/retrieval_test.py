@@ -1,50 +1,68 @@
 # test to retrieve top-k similar texts from the db
-from dotenv import load_dotenv
-from pathlib import Path
+#
+# NOTE: the ORDER BY must reference the raw distance operator
+# (VectorDB.vector.cosine_distance(...)) directly. Wrapping it in an
+# expression or alias (e.g. (1 - distance) AS score) stops the planner from
+# matching the HNSW index and regresses to a seq scan; assert_uses_hnsw below
+# guards against that.
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select, text
 
+from db.engine import Session # shared pooled engine; avoids a TLS handshake per run
 from db.model import VectorDB
 from models.embeddings.gemini_embedding_client import GenAITextEmbeddingClient
 
-load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+def configure_hnsw(session, k: int) -> None:
+    """
+    Sizes the HNSW candidate queue to the request: ef_search must be >= k for
+    full top-k recall, and ~4x k keeps recall high without over-scanning the
+    graph (floored at the pgvector default of 40). SET LOCAL scopes the setting
+    to the current transaction.
+    """
+    session.execute(text(f"SET LOCAL hnsw.ef_search = {max(40, 4 * k)}"))
 
-MAIN_DB_USER = os.getenv("MAIN_DB_USER")
-MAIN_DB_PW = os.getenv("MAIN_DB_PW")
-MAIN_DB_HOST = os.getenv("MAIN_DB_HOST")
-MAIN_DB_PORT = os.getenv("MAIN_DB_PORT")
-MAIN_DB_NAME = os.getenv("MAIN_DB_NAME")
-
-MAIN_DB_URL = f"postgresql+psycopg2://{MAIN_DB_USER}:{MAIN_DB_PW}@{MAIN_DB_HOST}:{MAIN_DB_PORT}/{MAIN_DB_NAME}?sslmode=require"
+def assert_uses_hnsw(session, stmt) -> None:
+    """
+    EXPLAINs the statement and asserts the plan walks an index rather than
+    seq-scanning the table (see the module note on ORDER BY form). Runs inside
+    the same transaction, so the SET LOCAL ef_search is in effect for the plan.
+    """
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    plan = session.execute(text("EXPLAIN " + sql)).all()
+    assert any("Index Scan" in row[0] for row in plan), (
+        "query does not use the HNSW index:\n" + "\n".join(row[0] for row in plan)
+    )
 
 if __name__ == "__main__":
     # test inputs
     sample_query = "fox jumping over a duck"
     top_k = 5
 
-    engine = create_engine(MAIN_DB_URL)
     embedding_client = GenAITextEmbeddingClient(api_key=os.getenv("GEMINI_API_KEY"))
 
     print(f"Query: {sample_query}")
     embeddings = embedding_client.embed_text([sample_query], task_type="RETRIEVAL_QUERY")
 
-    if not embeddings:
+    if embeddings is None or len(embeddings) == 0:
         print("Embedding failed, no result returned.")
         exit(1)
 
     query_vector = embeddings[0]
 
-    with sessionmaker(engine)() as session:
-        rows = (
-            session.query(VectorDB.text)
+    with Session() as session:
+        # without a sized ef_search the planner may skip ix_vector_db_hnsw
+        # entirely and fall back to a full seq scan + top-N heapsort
+        configure_hnsw(session, top_k)
+        stmt = (
+            select(VectorDB.text)
             .order_by(VectorDB.vector.cosine_distance(query_vector))
             .limit(top_k)
-            .all()
         )
-
-    results = [row.text for row in rows]
+        assert_uses_hnsw(session, stmt)
+        # scalars() unwraps the single selected column directly to list[str],
+        # skipping the Row named-tuple construction + per-row attribute access
+        results = session.scalars(stmt).all()
 
     if not results:
         print("No results returned.")